@@ -5,6 +5,7 @@ echo "Cleaning up progress files..."
 rm -f doctors_data_progress_*.csv
 rm -f doctors_data_interrupted.csv
 rm -f doctors_data_error.csv
+rm -f doctors_data_complete.csv.partial
 
 echo "✓ Progress files removed"
 echo "Keeping only: doctors_data_complete.csv"
@@ -6,42 +6,96 @@ Uses asyncio and aiohttp for concurrent scraping
 
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import csv
+import os
 import re
 from typing import List, Dict, Optional
 from datetime import datetime
 
 
+# Doctor name at the start of the detail page title (before the like count)
+_NAME_RE = re.compile(r'^([^\d]+)')
+
+# Font Awesome icon class -> field name for the detail page list items,
+# checked in order
+ICON_FIELDS = {
+    'fa-user-md': 'specialty',
+    'fa-calendar': 'experience',
+    'fa-phone': 'phone',
+    'fa-mobile': 'phone',
+    'fa-clock-o': 'work_hours',
+    'fa-map-marker': 'workplace',
+}
+
+# Output CSV columns
+CSV_FIELDNAMES = [
+    'name',
+    'specialty',
+    'specialty_preview',
+    'experience',
+    'phone',
+    'work_hours',
+    'workplace',
+    'workplace_url',
+    'likes',
+    'url'
+]
+
+
 class TibbiPortalScraper:
-    def __init__(self, max_concurrent: int = 10):
+    def __init__(self, max_concurrent: int = 10, output_file: str = 'doctors_data.csv'):
         self.base_url = "https://tibbiportal.az"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.doctors_data = []
+        self.output_file = output_file
+        # Rows stream here and only replace output_file once the run succeeds
+        self.partial_file = output_file + '.partial'
+        self.doctors_count = 0
         self.semaphore = asyncio.Semaphore(max_concurrent)
         self.session = None
+        self._csv_file = None
+        self._writer = None
 
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(headers=self.headers)
+        # Keep-alive connection pool with cached DNS so requests to the single
+        # origin reuse connections instead of re-handshaking
+        connector = aiohttp.TCPConnector(limit=50, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(
+            headers=self.headers,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        # Rows are streamed to the CSV as each listing page completes
+        self._csv_file = open(self.partial_file, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._csv_file, fieldnames=CSV_FIELDNAMES, extrasaction='ignore')
+        self._writer.writeheader()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         if self.session:
             await self.session.close()
-
-    async def get_page(self, url: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
+        if self._csv_file:
+            self._csv_file.close()
+            if exc_type is None:
+                os.replace(self.partial_file, self.output_file)
+                print(f"✓ Data saved to {self.output_file} ({self.doctors_count} records)")
+            else:
+                print(f"✗ Scraping did not finish - partial data ({self.doctors_count} records) "
+                      f"left in {self.partial_file}, {self.output_file} not modified")
+
+    async def get_page(self, url: str, max_retries: int = 3) -> Optional[LexborHTMLParser]:
         """Fetch and parse a page with retry logic"""
         async with self.semaphore:
             for attempt in range(max_retries):
                 try:
-                    async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    async with self.session.get(url) as response:
                         response.raise_for_status()
                         html = await response.text()
-                        return BeautifulSoup(html, 'html.parser')
+                        return LexborHTMLParser(html)
                 except Exception as e:
                     print(f"Error fetching {url} (attempt {attempt + 1}/{max_retries}): {e}")
                     if attempt < max_retries - 1:
@@ -55,24 +109,25 @@ class TibbiPortalScraper:
         url = f"{self.base_url}/search?page_objects=2&page_doctors={page_number}"
         print(f"Scraping listing page {page_number}...")
 
-        soup = await self.get_page(url)
-        if not soup:
+        tree = await self.get_page(url)
+        if not tree:
             return []
 
         doctors = []
-        doctor_items = soup.select('section#doctors .item')
+        doctor_items = tree.css('section#doctors .item')
 
         for item in doctor_items:
             try:
-                link_elem = item.find('a', href=True)
-                name_elem = item.find('h3')
-                specialty_elem = item.find('p')
+                link_elem = item.css_first('a[href]')
+                name_elem = item.css_first('h3')
+                specialty_elem = item.css_first('p')
 
                 if link_elem and name_elem:
+                    href = link_elem.attributes['href'] or ''
                     doctor = {
-                        'url': link_elem['href'] if link_elem['href'].startswith('http') else self.base_url + link_elem['href'],
-                        'name': name_elem.text.strip(),
-                        'specialty_preview': specialty_elem.text.strip() if specialty_elem else ''
+                        'url': href if href.startswith('http') else self.base_url + href,
+                        'name': name_elem.text().strip(),
+                        'specialty_preview': specialty_elem.text().strip() if specialty_elem else ''
                     }
                     doctors.append(doctor)
             except Exception as e:
@@ -81,65 +136,58 @@ class TibbiPortalScraper:
 
         return doctors
 
-    async def extract_doctor_details(self, doctor_url: str, doctor_name: str) -> Dict[str, str]:
-        """Extract detailed information from a doctor's detail page"""
-        soup = await self.get_page(doctor_url)
-        if not soup:
-            return {'url': doctor_url}
-
-        details = {'url': doctor_url}
+    async def extract_doctor_details(self, doctor: Dict[str, str]) -> Dict[str, str]:
+        """Fill a listing doctor dict in place with information from its detail page"""
+        doctor_url = doctor['url']
+        tree = await self.get_page(doctor_url)
+        if not tree:
+            return doctor
 
         try:
             # Extract name from widget title
-            title_elem = soup.select_one('section.item-detail .widget-title')
+            title_elem = tree.css_first('section.item-detail .widget-title')
             if title_elem:
                 # Remove the heart icon and count from the title
-                title_text = title_elem.get_text(strip=True)
+                title_text = title_elem.text(strip=True)
                 # Extract just the name (before any numbers)
-                name_match = re.match(r'^([^\d]+)', title_text)
+                name_match = _NAME_RE.match(title_text)
                 if name_match:
-                    details['name'] = name_match.group(1).strip()
+                    doctor['name'] = name_match.group(1).strip()
 
             # Extract like count
-            like_count_elem = soup.select_one('.rateItemCount')
+            like_count_elem = tree.css_first('.rateItemCount')
             if like_count_elem:
-                details['likes'] = like_count_elem.text.strip()
+                doctor['likes'] = like_count_elem.text().strip()
 
-            # Extract information from the list items
-            list_items = soup.select('section.item-detail ul li')
+            # Extract information from the list items that have both an icon and a value
+            list_items = tree.css('section.item-detail ul li:has(i):has(span)')
 
             for li in list_items:
-                icon = li.find('i')
-                span = li.find('span')
+                icon = li.css_first('i')
+                span = li.css_first('span')
+                icon_class = icon.attributes.get('class') or ''
+                text = span.text().strip()
 
-                if not icon or not span:
+                # Parse based on icon type
+                field = next((f for token, f in ICON_FIELDS.items() if token in icon_class), None)
+                if field is None:
                     continue
 
-                icon_class = ' '.join(icon.get('class', []))
-                text = span.text.strip()
-
-                # Parse based on icon type
-                if 'fa-user-md' in icon_class:
-                    details['specialty'] = text
-                elif 'fa-calendar' in icon_class:
-                    details['experience'] = text
-                elif 'fa-phone' in icon_class or 'fa-mobile' in icon_class:
-                    details['phone'] = text
-                elif 'fa-clock-o' in icon_class:
-                    details['work_hours'] = text
-                elif 'fa-map-marker' in icon_class:
+                if field == 'workplace':
                     # Extract workplace
-                    workplace_link = li.find('a')
+                    workplace_link = li.css_first('a')
                     if workplace_link:
-                        details['workplace'] = workplace_link.text.strip()
-                        details['workplace_url'] = workplace_link.get('href', '')
+                        doctor['workplace'] = workplace_link.text().strip()
+                        doctor['workplace_url'] = workplace_link.attributes.get('href') or ''
                     else:
-                        details['workplace'] = text
+                        doctor['workplace'] = text
+                else:
+                    doctor[field] = text
 
         except Exception as e:
             print(f"Error extracting details from {doctor_url}: {e}")
 
-        return details
+        return doctor
 
     async def scrape_page(self, page_number: int, total_pages: int):
         """Scrape a single listing page and all its doctors"""
@@ -154,135 +202,106 @@ class TibbiPortalScraper:
 
         # Fetch details for all doctors on this page concurrently
         print(f"Fetching details for {len(doctors)} doctors...")
-        tasks = [
-            self.extract_doctor_details(doctor['url'], doctor['name'])
-            for doctor in doctors
-        ]
-        details_list = await asyncio.gather(*tasks)
+        tasks = [self.extract_doctor_details(doctor) for doctor in doctors]
+        await asyncio.gather(*tasks)
 
-        # Merge listing info with details
-        for doctor, details in zip(doctors, details_list):
-            doctor.update(details)
-            self.doctors_data.append(doctor)
+        # Write the page to disk right away so progress survives interruptions
+        self._writer.writerows(doctors)
+        self._csv_file.flush()
+        self.doctors_count += len(doctors)
 
         print(f"✓ Page {page_number} completed: {len(doctors)} doctors scraped")
 
-    async def scrape_all_doctors(self, start_page: int = 1, end_page: int = 214, batch_size: int = 5):
+    async def scrape_all_doctors(self, start_page: int = 1, end_page: int = 214, page_workers: int = 3):
         """
         Scrape all doctors from listing pages and their detail pages
 
+        A few page workers pull page numbers from a queue, so detail pages of
+        earlier listings keep flowing while later listings are still pending.
+        Request concurrency is bounded by the request semaphore.
+
         Args:
             start_page: First page to scrape
             end_page: Last page to scrape
-            batch_size: Number of listing pages to process concurrently
+            page_workers: Number of listing pages processed at the same time
         """
         print(f"Starting async scraper...")
         print(f"Pages: {start_page} to {end_page}")
-        print(f"Batch size: {batch_size} pages at a time")
+        print(f"Page workers: {page_workers}")
         print(f"This will scrape much faster than the synchronous version!\n")
 
         start_time = datetime.now()
 
-        # Process pages in batches
-        for batch_start in range(start_page, end_page + 1, batch_size):
-            batch_end = min(batch_start + batch_size - 1, end_page)
-            batch_pages = range(batch_start, batch_end + 1)
-
-            print(f"\n{'='*60}")
-            print(f"Processing batch: pages {batch_start}-{batch_end}")
-            print(f"{'='*60}")
-
-            # Scrape multiple pages concurrently
-            tasks = [self.scrape_page(page_num, end_page) for page_num in batch_pages]
-            await asyncio.gather(*tasks)
-
-            # Display progress
-            elapsed = (datetime.now() - start_time).total_seconds()
-            rate = len(self.doctors_data) / elapsed if elapsed > 0 else 0
-            print(f"\n✓ Progress: {len(self.doctors_data)} doctors scraped")
-            print(f"  Time elapsed: {elapsed:.1f}s | Rate: {rate:.1f} doctors/sec")
+        queue = asyncio.Queue()
+        for page_num in range(start_page, end_page + 1):
+            queue.put_nowait(page_num)
+        total_pages = queue.qsize()
+        pages_done = 0
 
-            # Small delay between batches
-            await asyncio.sleep(1)
+        async def page_worker():
+            nonlocal pages_done
+            while True:
+                try:
+                    page_num = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self.scrape_page(page_num, end_page)
+                pages_done += 1
+
+                # Display progress
+                elapsed = (datetime.now() - start_time).total_seconds()
+                rate = self.doctors_count / elapsed if elapsed > 0 else 0
+                print(f"\n✓ Progress: {pages_done}/{total_pages} pages, {self.doctors_count} doctors scraped")
+                print(f"  Time elapsed: {elapsed:.1f}s | Rate: {rate:.1f} doctors/sec")
+
+        workers = [asyncio.create_task(page_worker()) for _ in range(page_workers)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # If one worker fails, stop the others before the session and CSV close
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
         elapsed = (datetime.now() - start_time).total_seconds()
         print(f"\n{'='*60}")
         print(f"✓ Scraping completed!")
-        print(f"  Total doctors: {len(self.doctors_data)}")
+        print(f"  Total doctors: {self.doctors_count}")
         print(f"  Total time: {elapsed:.1f}s ({elapsed/60:.1f} minutes)")
-        print(f"  Average rate: {len(self.doctors_data)/elapsed:.1f} doctors/sec")
+        print(f"  Average rate: {self.doctors_count/elapsed:.1f} doctors/sec")
         print(f"{'='*60}")
 
-    def save_to_csv(self, filename: str = 'doctors_data.csv'):
-        """Save scraped data to CSV file"""
-        if not self.doctors_data:
-            print("No data to save!")
-            return
-
-        # Define all possible fields
-        fieldnames = [
-            'name',
-            'specialty',
-            'specialty_preview',
-            'experience',
-            'phone',
-            'work_hours',
-            'workplace',
-            'workplace_url',
-            'likes',
-            'url'
-        ]
-
-        try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-                writer.writeheader()
-
-                for doctor in self.doctors_data:
-                    writer.writerow(doctor)
-
-            print(f"✓ Data saved to {filename} ({len(self.doctors_data)} records)")
-        except Exception as e:
-            print(f"Error saving to CSV: {e}")
-
 
 async def main():
     # Configuration
     start_page = 1
     end_page = 214
-    batch_size = 5  # Process 5 listing pages at a time
-    max_concurrent = 10  # Max concurrent connections per batch
+    page_workers = 3  # Listing pages processed at the same time
+    max_concurrent = 10  # Max concurrent connections
 
     print("Tibbiportal.az Async Doctor Scraper")
     print("=" * 60)
     print(f"Configuration:")
     print(f"  Pages to scrape: {start_page} to {end_page}")
-    print(f"  Batch size: {batch_size} pages")
+    print(f"  Page workers: {page_workers}")
     print(f"  Max concurrent connections: {max_concurrent}")
     print(f"  Expected total doctors: ~2136")
     print("=" * 60)
     print()
 
-    try:
-        async with TibbiPortalScraper(max_concurrent=max_concurrent) as scraper:
-            await scraper.scrape_all_doctors(
-                start_page=start_page,
-                end_page=end_page,
-                batch_size=batch_size
-            )
-            scraper.save_to_csv('doctors_data_complete.csv')
-    except KeyboardInterrupt:
-        print("\n\nScraping interrupted by user!")
-        print("Saving progress...")
-        if scraper:
-            scraper.save_to_csv('doctors_data_interrupted.csv')
-    except Exception as e:
-        print(f"\n\nUnexpected error: {e}")
-        print("Saving progress...")
-        if scraper:
-            scraper.save_to_csv('doctors_data_error.csv')
-        raise
+    # On failure or Ctrl+C, __aexit__ reports where the partial data was left
+    async with TibbiPortalScraper(max_concurrent=max_concurrent,
+                                  output_file='doctors_data_complete.csv') as scraper:
+        await scraper.scrape_all_doctors(
+            start_page=start_page,
+            end_page=end_page,
+            page_workers=page_workers
+        )
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # asyncio.run cancels main() on Ctrl+C and re-raises KeyboardInterrupt here
+        print("\n\nScraping interrupted by user!")